@@ -0,0 +1,437 @@
+"""FastAPI gateway for the Lab 1 LLMOps pipeline.
+
+Exposes an OpenAI-compatible /v1/chat/completions endpoint backed by
+LiteLLM (Azure OpenAI by default, local Ollama as a fallback), with a
+Redis response cache, a Jinja prompt template, and per-request MLflow
+logging.
+
+    uvicorn app.main:app --port 8000 --loop uvloop --http httptools
+"""
+
+import asyncio
+import hashlib
+import logging
+import os
+import time
+import uuid
+from datetime import datetime
+from pathlib import Path
+
+import litellm
+import mlflow
+import orjson
+import redis.asyncio as aioredis
+from redis import RedisError
+from fastapi import FastAPI, HTTPException, Request
+from fastapi.responses import ORJSONResponse, StreamingResponse
+from jinja2 import Environment
+from pydantic import BaseModel, ValidationError
+
+PROMPT_PATH = Path(__file__).resolve().parent.parent / "prompts" / "prompt_template.jinja2"
+PROMPT_CONTENT = PROMPT_PATH.read_text()
+# Compile once through an explicit Environment; auto_reload off means no
+# per-render staleness checks.
+_jinja_env = Environment(auto_reload=False)
+prompt_template = _jinja_env.from_string(PROMPT_CONTENT)
+
+
+def _build_fast_renderer():
+    """Specialize rendering for the known template shape.
+
+    The prompt is plain interpolation of three variables, so the full
+    Jinja render pipeline per request is overkill. Render once with
+    sentinel values, split out the constant segments, and emit a renderer
+    that is just string concatenation. Returns None (Jinja fallback) if
+    the template stops being simple interpolation with each variable
+    appearing exactly once, in order.
+    """
+    s_date, s_dept, s_q = "\x00DATE\x00", "\x00DEPT\x00", "\x00Q\x00"
+    probe = prompt_template.render(
+        current_date=s_date, department=s_dept, user_question=s_q
+    )
+    if not (probe.count(s_date) == probe.count(s_dept) == probe.count(s_q) == 1):
+        return None
+    try:
+        seg0, rest = probe.split(s_dept)
+        seg1, rest = rest.split(s_date)
+        seg2, seg3 = rest.split(s_q)
+    except ValueError:  # placeholders out of the expected order
+        return None
+
+    def render_fast(date: str, department: str, question: str) -> str:
+        return seg0 + department + seg1 + date + seg2 + question + seg3
+
+    return render_fast
+
+
+_render_fast = _build_fast_renderer()
+
+# datetime.now().strftime is surprisingly costly to run per request for a
+# value that changes once a day; cache the formatted date for 60s.
+_date_cache = {"ts": 0.0, "val": ""}
+
+
+def _today() -> str:
+    now = time.time()
+    if now - _date_cache["ts"] >= 60:
+        _date_cache["val"] = datetime.now().strftime("%Y-%m-%d")
+        _date_cache["ts"] = now
+    return _date_cache["val"]
+
+
+logging.basicConfig(level=os.getenv("LOG_LEVEL", "INFO"))
+logger = logging.getLogger("llmops")
+
+LLM_PROVIDER = os.getenv("LLM_PROVIDER", "azure")
+if LLM_PROVIDER == "azure":
+    MODEL = "azure/" + os.getenv("AZURE_OPENAI_DEPLOYMENT", "gpt-4o-mini")
+else:
+    MODEL = "ollama/llama3.2:3b"
+
+# Async client: cache lookups must not stall the event loop inside the
+# async handlers.
+r = aioredis.Redis(
+    host=os.getenv("REDIS_HOST", "localhost"),
+    port=int(os.getenv("REDIS_PORT", "6379")),
+    decode_responses=True,
+)
+
+mlflow.set_tracking_uri(os.getenv("MLFLOW_TRACKING_URI", "sqlite:///mlflow.db"))
+mlflow.set_experiment("llmops-lab1-gateway")
+
+REDIS_URL = "redis://{}:{}".format(
+    os.getenv("REDIS_HOST", "localhost"), os.getenv("REDIS_PORT", "6379")
+)
+SEMANTIC_DISTANCE_THRESHOLD = float(os.getenv("SEMANTIC_DISTANCE_THRESHOLD", "0.2"))
+
+try:
+    from redisvl.extensions.llmcache import SemanticCache
+    from redisvl.utils.vectorize import HFTextVectorizer
+except ImportError:  # semantic tier is optional; exact-match still works
+    SemanticCache = None
+
+# Second cache tier: the exact-match key above only catches byte-identical
+# requests, so paraphrases ("What's LLMOps?" vs "Define LLMOps") always
+# miss. The semantic tier embeds the rendered prompt and serves KNN hits
+# within the distance threshold. The rendered prompt already bakes in the
+# department, so no separate tag filter is needed.
+semantic_cache = None
+
+app = FastAPI(title="LLMOps Lab 1 Gateway")
+
+# Strong references to in-flight background writes so they are not
+# garbage-collected before completing.
+_pending_writes: set[asyncio.Task] = set()
+
+
+def _background(coro) -> None:
+    task = asyncio.create_task(coro)
+    _pending_writes.add(task)
+    task.add_done_callback(_pending_writes.discard)
+
+
+# Tracking-server RPCs have no business on the request path: handlers
+# enqueue a record and a background worker does the actual MLflow calls
+# in a thread, so responses return as soon as the LLM replies.
+MLFLOW_Q: asyncio.Queue = asyncio.Queue()
+
+
+def _log_to_mlflow(record: dict) -> None:
+    # log_params/log_metrics hit MLflow's batch endpoints: two RPCs per
+    # request instead of one per field.
+    with mlflow.start_run(run_name=record["run_name"]):
+        mlflow.log_params(record["params"])
+        mlflow.log_metrics(record["metrics"])
+
+
+async def _mlflow_worker() -> None:
+    loop = asyncio.get_running_loop()
+    while True:
+        record = await MLFLOW_Q.get()
+        try:
+            await loop.run_in_executor(None, _log_to_mlflow, record)
+        except Exception as exc:  # logging must never break serving
+            logger.warning("MLflow logging failed: %s", exc)
+        finally:
+            MLFLOW_Q.task_done()
+
+
+@app.on_event("startup")
+async def _start_mlflow_worker():
+    _background(_mlflow_worker())
+
+
+async def _store_exact(key: str, value: bytes, department: str) -> None:
+    # Ship the cache write and the per-department miss counter in one RTT.
+    async with r.pipeline(transaction=False) as pipe:
+        pipe.setex(key, 3600, value)
+        pipe.hincrby(f"stats:{department}", "misses", 1)
+        await pipe.execute()
+
+
+@app.on_event("startup")
+async def _init_semantic_cache():
+    global semantic_cache
+    if SemanticCache is None:
+        return
+    semantic_cache = SemanticCache(
+        name="llm_cache",
+        redis_url=REDIS_URL,
+        distance_threshold=SEMANTIC_DISTANCE_THRESHOLD,
+        vectorizer=HFTextVectorizer("sentence-transformers/all-MiniLM-L6-v2"),
+    )
+
+
+class ChatMessage(BaseModel):
+    role: str
+    content: str
+
+
+class ChatCompletionRequest(BaseModel):
+    model: str | None = None
+    messages: list[ChatMessage]
+    temperature: float = 0.0
+    department: str = "general"
+    stream: bool = False
+
+
+try:
+    import xxhash
+
+    def _key_digest(content: bytes) -> str:
+        return xxhash.xxh3_128(content).hexdigest()
+
+except ImportError:
+
+    def _key_digest(content: bytes) -> str:
+        return hashlib.blake2b(content, digest_size=16).hexdigest()
+
+
+def get_cache_key(body: bytes) -> str:
+    # Cache keying is not a security boundary: 128 bits of a fast
+    # non-cryptographic hash is plenty, and xxh3 is an order of magnitude
+    # cheaper than SHA-256 on short payloads. Hashing the raw request body
+    # also means no pydantic parse and no per-message dict copies are paid
+    # before the cache verdict is known.
+    return "cache:" + _key_digest(body)
+
+
+def _make_payload(model: str, content: str, finish_reason: str, usage: dict) -> dict:
+    return {
+        "id": f"chatcmpl-{uuid.uuid4().hex[:12]}",
+        "object": "chat.completion",
+        "created": int(time.time()),
+        "model": model,
+        "choices": [
+            {
+                "index": 0,
+                "message": {"role": "assistant", "content": content},
+                "finish_reason": finish_reason,
+            }
+        ],
+        "usage": usage,
+    }
+
+
+def _sse_replay(payload: dict, cache_tier: str = "exact-hit") -> StreamingResponse:
+    """Serve a cached completion to a stream:true client as SSE.
+
+    Two chunks (full content, then finish) plus [DONE] — the shape
+    OpenAI-SDK streaming clients expect, just without the token cadence.
+    """
+    head = {
+        "id": payload["id"],
+        "object": "chat.completion.chunk",
+        "created": payload["created"],
+        "model": payload["model"],
+    }
+    content = payload["choices"][0]["message"]["content"]
+
+    async def gen():
+        yield b"data: " + orjson.dumps(
+            head
+            | {
+                "choices": [
+                    {
+                        "index": 0,
+                        "delta": {"role": "assistant", "content": content},
+                        "finish_reason": None,
+                    }
+                ]
+            }
+        ) + b"\n\n"
+        yield b"data: " + orjson.dumps(
+            head | {"choices": [{"index": 0, "delta": {}, "finish_reason": "stop"}]}
+        ) + b"\n\n"
+        yield b"data: [DONE]\n\n"
+
+    return StreamingResponse(
+        gen(), media_type="text/event-stream", headers={"X-Cache": cache_tier}
+    )
+
+
+@app.get("/health")
+async def health():
+    try:
+        await r.ping()
+        redis_ok = True
+    except RedisError:
+        redis_ok = False
+    return {"status": "ok", "redis": redis_ok, "model": MODEL}
+
+
+@app.post("/v1/chat/completions")
+async def chat_completions(raw_request: Request):
+    start = time.monotonic()
+
+    body = await raw_request.body()
+    cache_key = get_cache_key(body)
+    # One round trip for the cache probe plus the rate counter instead of
+    # two. (The department is only known after parsing, so the inbound
+    # counter is global; per-department miss stats are kept on the write.)
+    async with r.pipeline(transaction=False) as pipe:
+        pipe.get(cache_key)
+        pipe.incr("rate:global")
+        cached, _ = await pipe.execute()
+    if cached:
+        logger.debug("Cache HIT (exact)")
+        payload = orjson.loads(cached)
+        # The key hashes the raw body, so a hit under a stream:true body
+        # was stored by the streaming branch (flagged below) and must be
+        # replayed as SSE, not returned as a plain JSON completion.
+        if payload.pop("_stream", False):
+            return _sse_replay(payload)
+        return ORJSONResponse(payload, headers={"X-Cache": "exact-hit"})
+
+    # Only misses pay for request validation. Parsing by hand means the
+    # 422 FastAPI used to synthesize is ours to raise now.
+    try:
+        request = ChatCompletionRequest.model_validate_json(body)
+    except ValidationError as exc:
+        raise HTTPException(
+            status_code=422,
+            detail=exc.errors(include_url=False, include_context=False, include_input=False),
+        ) from None
+    if not request.messages:
+        raise HTTPException(status_code=400, detail="messages must not be empty")
+    user_msg = request.messages[-1].content
+
+    if _render_fast is not None:
+        rendered = _render_fast(_today(), request.department, user_msg)
+    else:
+        rendered = prompt_template.render(
+            current_date=_today(),
+            department=request.department,
+            user_question=user_msg,
+        )
+
+    if semantic_cache is not None:
+        hits = await semantic_cache.acheck(prompt=rendered, num_results=1)
+        if hits:
+            logger.debug("Cache HIT (semantic)")
+            payload = _make_payload(
+                request.model or MODEL, hits[0]["response"], "stop", {}
+            )
+            # Same wire-format contract as the exact tier: a stream:true
+            # client gets its hit replayed as SSE, not as plain JSON.
+            if request.stream:
+                return _sse_replay(payload, "semantic-hit")
+            return ORJSONResponse(payload, headers={"X-Cache": "semantic-hit"})
+    logger.debug("Cache MISS")
+
+    llm_params = {
+        "model": request.model or MODEL,
+        "messages": [{"role": "user", "content": rendered}],
+        "temperature": request.temperature,
+    }
+    if request.stream:
+        # Stream tokens as OpenAI-style SSE so clients see a first token in
+        # hundreds of ms instead of waiting for the full completion. The
+        # full text is buffered alongside so both cache tiers still get
+        # populated when the stream finishes.
+        async def event_gen():
+            pieces: list[str] = []
+            stream = await litellm.acompletion(stream=True, **llm_params)
+            async for chunk in stream:
+                delta = chunk.choices[0].delta.content or ""
+                if delta:
+                    pieces.append(delta)
+                yield b"data: " + orjson.dumps(chunk.model_dump()) + b"\n\n"
+            yield b"data: [DONE]\n\n"
+
+            answer = "".join(pieces)
+            payload = _make_payload(llm_params["model"], answer, "stop", {})
+            _background(
+                _store_exact(
+                    cache_key,
+                    orjson.dumps(payload | {"_stream": True}),
+                    request.department,
+                )
+            )
+            if semantic_cache is not None:
+                _background(
+                    semantic_cache.astore(
+                        prompt=rendered,
+                        response=answer,
+                        metadata={"department": request.department},
+                    )
+                )
+
+        return StreamingResponse(event_gen(), media_type="text/event-stream")
+
+    # acompletion keeps the event loop free during the multi-second LLM
+    # round trip, so cache hits and health probes are served meanwhile.
+    response = await litellm.acompletion(**llm_params)
+
+    latency_ms = (time.monotonic() - start) * 1000
+    answer = response.choices[0].message.content
+    resp_payload = _make_payload(
+        llm_params["model"],
+        answer,
+        response.choices[0].finish_reason,
+        response.usage.model_dump() if response.usage else {},
+    )
+
+    MLFLOW_Q.put_nowait(
+        {
+            "run_name": f"chat-{resp_payload['id']}",
+            "params": {
+                "provider": LLM_PROVIDER,
+                "model": llm_params["model"],
+                "temperature": request.temperature,
+                "department": request.department,
+            },
+            "metrics": {
+                "latency_ms": latency_ms,
+                "prompt_tokens": resp_payload["usage"].get("prompt_tokens", 0),
+                "completion_tokens": resp_payload["usage"].get("completion_tokens", 0),
+            },
+        }
+    )
+
+    # Fire-and-forget: don't hold the response hostage to a Redis RTT.
+    _background(_store_exact(cache_key, orjson.dumps(resp_payload), request.department))
+    if semantic_cache is not None:
+        _background(
+            semantic_cache.astore(
+                prompt=rendered,
+                response=answer,
+                metadata={"department": request.department},
+            )
+        )
+    return ORJSONResponse(resp_payload, headers={"X-Cache": "miss"})
+
+
+if __name__ == "__main__":
+    import uvicorn
+
+    # uvloop (libuv-backed loop) and httptools cut asyncio scheduling and
+    # HTTP parsing overhead 2-4x with no code changes.
+    uvicorn.run(
+        "main:app",
+        host="0.0.0.0",
+        port=int(os.getenv("PORT", "8000")),
+        loop="uvloop",
+        http="httptools",
+        workers=int(os.getenv("WEB_CONCURRENCY", "1")),
+    )
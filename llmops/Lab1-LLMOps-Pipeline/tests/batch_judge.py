@@ -0,0 +1,123 @@
+"""Route Ragas judge prompts through the Azure/OpenAI Batch API.
+
+Batch jobs price at roughly half the synchronous rate and collapse the
+N-row x M-metric judge fan-out into a single upload/poll/download cycle.
+The trade-off is the completion window (up to 24h, usually minutes for
+small jobs), so this is opt-in: set RAGAS_USE_BATCH_API=1 before running
+eval_ragas.py.
+"""
+
+import asyncio
+import io
+import json
+import os
+import time
+import uuid
+
+from langchain_core.outputs import Generation, LLMResult
+from openai import AzureOpenAI
+from ragas.llms import BaseRagasLLM
+
+POLL_INTERVAL = float(os.getenv("BATCH_POLL_INTERVAL", "10"))
+
+
+class BatchJudgeLLM(BaseRagasLLM):
+    """BaseRagasLLM that coalesces concurrent judge calls into one batch job.
+
+    Ragas fires its judge prompts concurrently through the run config
+    executor; each call parks on a future while a short flush window
+    collects the rest. The flusher then writes one JSONL file keyed by
+    custom_id, submits it to /v1/batches, polls to completion, and maps
+    the outputs back onto the waiting futures.
+    """
+
+    def __init__(self, deployment: str | None = None, window_s: float = 2.0):
+        self.client = AzureOpenAI(
+            azure_endpoint=os.getenv("AZURE_OPENAI_ENDPOINT", ""),
+            api_version=os.getenv("AZURE_OPENAI_API_VERSION", "2024-07-01-preview"),
+        )
+        self.deployment = deployment or os.getenv("AZURE_OPENAI_DEPLOYMENT", "gpt-4o-mini")
+        self.window = window_s
+        self._pending: dict[str, tuple[str, float, asyncio.Future]] = {}
+        self._flusher: asyncio.Task | None = None
+
+    def generate_text(self, prompt, n=1, temperature=1e-8, stop=None, callbacks=None):
+        return asyncio.run(self.agenerate_text(prompt, n, temperature, stop, callbacks))
+
+    async def agenerate_text(self, prompt, n=1, temperature=1e-8, stop=None, callbacks=None):
+        loop = asyncio.get_running_loop()
+        future: asyncio.Future = loop.create_future()
+        custom_id = uuid.uuid4().hex
+        self._pending[custom_id] = (prompt.to_string(), temperature, future)
+        if self._flusher is None or self._flusher.done():
+            self._flusher = asyncio.create_task(self._flush_soon())
+        text = await future
+        return LLMResult(generations=[[Generation(text=text)]])
+
+    async def _flush_soon(self) -> None:
+        await asyncio.sleep(self.window)
+        pending, self._pending = self._pending, {}
+        if not pending:
+            return
+        loop = asyncio.get_running_loop()
+        requests = {cid: (p, t) for cid, (p, t, _) in pending.items()}
+        try:
+            outputs = await loop.run_in_executor(None, self._run_batch, requests)
+            for custom_id, (_, _, future) in pending.items():
+                if future.done():
+                    continue
+                if custom_id in outputs:
+                    future.set_result(outputs[custom_id])
+                else:
+                    future.set_exception(
+                        RuntimeError(f"batch output missing custom_id {custom_id}")
+                    )
+        except Exception as exc:
+            for _, _, future in pending.values():
+                if not future.done():
+                    future.set_exception(exc)
+        finally:
+            # Calls that arrived while this batch was in flight found a
+            # not-yet-done flusher and didn't schedule a new one; without
+            # a re-arm here their futures would strand until some later
+            # call happens to create a fresh flusher.
+            if self._pending:
+                self._flusher = asyncio.create_task(self._flush_soon())
+
+    def _run_batch(self, requests: dict[str, tuple[str, float]]) -> dict[str, str]:
+        lines = [
+            json.dumps(
+                {
+                    "custom_id": custom_id,
+                    "method": "POST",
+                    "url": "/v1/chat/completions",
+                    "body": {
+                        "model": self.deployment,
+                        "temperature": temperature,
+                        "messages": [{"role": "user", "content": prompt}],
+                    },
+                }
+            )
+            for custom_id, (prompt, temperature) in requests.items()
+        ]
+        upload = self.client.files.create(
+            file=io.BytesIO("\n".join(lines).encode()), purpose="batch"
+        )
+        job = self.client.batches.create(
+            input_file_id=upload.id,
+            endpoint="/v1/chat/completions",
+            completion_window="24h",
+        )
+        while job.status not in ("completed", "failed", "expired", "cancelled"):
+            time.sleep(POLL_INTERVAL)
+            job = self.client.batches.retrieve(job.id)
+        if job.status != "completed":
+            raise RuntimeError(f"batch job {job.id} ended with status {job.status}")
+
+        outputs: dict[str, str] = {}
+        raw = self.client.files.content(job.output_file_id).text
+        for line in raw.splitlines():
+            record = json.loads(line)
+            body = record["response"]["body"]
+            outputs[record["custom_id"]] = body["choices"][0]["message"]["content"]
+        return outputs
@@ -0,0 +1,354 @@
+"""Ragas evaluation harness for the Lab 1 LLMOps gateway.
+
+Fires the evaluation questions at the running /v1/chat/completions API,
+then scores the answers with Ragas (faithfulness + answer relevancy)
+using an Azure OpenAI judge, and logs everything to MLflow.
+
+Run the gateway first (see app/main.py), then:
+
+    python tests/eval_ragas.py
+"""
+
+import asyncio
+import concurrent.futures
+import functools
+import os
+import time
+
+import httpx
+import orjson
+from langchain_core.embeddings import Embeddings
+
+# mlflow, datasets, ragas, and the langchain provider packages are
+# multi-second imports; they load inside the functions that use them so
+# `import eval_ragas` (and -h / smoke runs) stays near-instant.
+
+API_URL = os.getenv("API_URL", "http://localhost:8000/v1/chat/completions")
+
+# On-disk embedding cache, shared with the Lab 2 apps (same env var, same
+# default path); embeddings are namespaced per model inside the store.
+EMB_CACHE_DIR = os.getenv(
+    "EMB_CACHE_DIR", os.path.expanduser("~/.cache/llmops-embeddings")
+)
+
+# Artifact uploads overlap with eval teardown instead of blocking the
+# caller on the artifact-store network write; the pool is joined at
+# interpreter exit.
+_ARTIFACT_POOL = concurrent.futures.ThreadPoolExecutor(max_workers=2)
+
+# Cap in-flight eval requests so large eval sets don't trip Azure TPM/RPM
+# limits; the fan-out stays fully async below this bound.
+MAX_CONCURRENCY = int(os.getenv("EVAL_MAX_CONCURRENCY", "8"))
+
+EVAL_DATA = [
+    {
+        "question": "What are the 9 stages of an MLOps pipeline?",
+        "ground_truth": (
+            "Business understanding, data engineering, EDA, model training, "
+            "validation, packaging, deployment, monitoring, and retraining."
+        ),
+    },
+    {
+        "question": "Why should experiments be tracked with MLflow?",
+        "ground_truth": (
+            "MLflow records parameters, metrics, and artifacts per run so "
+            "experiments are reproducible and comparable."
+        ),
+    },
+    {
+        "question": "What does data drift detection tell us?",
+        "ground_truth": (
+            "Drift detection flags when production data distributions diverge "
+            "from training data, signalling the model may need retraining."
+        ),
+    },
+]
+
+
+@functools.lru_cache(maxsize=1)
+def _shared_sync_client() -> httpx.Client:
+    # One keep-alive pool shared by every Azure client built below, so
+    # judge calls multiplex warm connections instead of each client
+    # owning its own.
+    return httpx.Client(timeout=60)
+
+
+@functools.lru_cache(maxsize=1)
+def get_azure_llm() -> "AzureChatOpenAI":
+    """Judge LLM for Ragas metrics, built once per process."""
+    from langchain_openai import AzureChatOpenAI
+
+    return AzureChatOpenAI(
+        azure_endpoint=os.getenv("AZURE_OPENAI_ENDPOINT", ""),
+        azure_deployment=os.getenv("AZURE_OPENAI_DEPLOYMENT", "gpt-4o-mini"),
+        api_version=os.getenv("AZURE_OPENAI_API_VERSION", "2024-02-01"),
+        temperature=0.0,
+        http_client=_shared_sync_client(),
+    )
+
+
+class OnnxMiniLMEmbeddings(Embeddings):
+    """Mean-pooled MiniLM embeddings through an int8-quantized ONNX export.
+
+    Roughly 2-4x the CPU throughput of the PyTorch model at negligible
+    quality loss for cosine-similarity scoring. Export and quantize once:
+
+        optimum-cli export onnx --model sentence-transformers/all-MiniLM-L6-v2 \\
+            --task feature-extraction minilm_onnx/
+        optimum-cli onnxruntime quantize --avx512 --onnx_model minilm_onnx/ \\
+            -o minilm_int8/
+    """
+
+    def __init__(self, model_dir: str = "minilm_int8"):
+        from optimum.onnxruntime import ORTModelForFeatureExtraction
+        from transformers import AutoTokenizer
+
+        self.tokenizer = AutoTokenizer.from_pretrained(model_dir)
+        self.model = ORTModelForFeatureExtraction.from_pretrained(model_dir)
+
+    def _embed(self, texts: list[str]) -> list[list[float]]:
+        import numpy as np
+
+        enc = self.tokenizer(texts, padding=True, truncation=True, return_tensors="np")
+        hidden = self.model(**enc).last_hidden_state
+        mask = enc["attention_mask"][..., None]
+        pooled = (hidden * mask).sum(axis=1) / np.clip(mask.sum(axis=1), 1, None)
+        norms = np.linalg.norm(pooled, axis=1, keepdims=True)
+        return (pooled / np.clip(norms, 1e-12, None)).tolist()
+
+    def embed_documents(self, texts: list[str]) -> list[list[float]]:
+        return self._embed(texts)
+
+    def embed_query(self, text: str) -> list[float]:
+        return self._embed([text])[0]
+
+
+@functools.lru_cache(maxsize=1)
+def get_embedder() -> Embeddings:
+    """MiniLM embedder, built once per process.
+
+    Constructing HuggingFaceEmbeddings loads (and on a cold cache,
+    downloads) the model, which costs seconds — pay it at most once, on
+    first use rather than at import. Set SENTENCE_TRANSFORMERS_HOME to a
+    pre-baked model directory to avoid the download entirely.
+    """
+    from langchain.embeddings import CacheBackedEmbeddings
+    from langchain.storage import LocalFileStore
+
+    if os.getenv("EMBEDDINGS_BACKEND", "torch") == "onnx-int8":
+        base: Embeddings = OnnxMiniLMEmbeddings(
+            os.getenv("ONNX_MODEL_DIR", "minilm_int8")
+        )
+        namespace = "minilm-int8"
+    else:
+        from langchain_huggingface import HuggingFaceEmbeddings
+
+        base = HuggingFaceEmbeddings(
+            model_name="all-MiniLM-L6-v2",
+            model_kwargs={"device": "cpu"},
+            encode_kwargs={"normalize_embeddings": True, "batch_size": 64},
+        )
+        namespace = "all-MiniLM-L6-v2"
+    # Identical texts recur across eval runs (the eval set is fixed), so
+    # a file-backed cache turns repeat runs' embedding cost into disk reads.
+    return CacheBackedEmbeddings.from_bytes_store(
+        base, LocalFileStore(EMB_CACHE_DIR), namespace=namespace
+    )
+
+
+class MicroBatchingEmbeddings(Embeddings):
+    """Coalesce concurrent single-text embed calls into batched forwards.
+
+    Ragas drives answer relevancy through one-at-a-time embed_query calls,
+    but sentence-transformers is an order of magnitude faster on a batch.
+    Concurrent aembed_query calls are parked on a queue and drained up to
+    max_batch at a time within a short window, then served by a single
+    embed_documents forward pass. Numerics are identical.
+    """
+
+    def __init__(self, base: Embeddings, max_batch: int = 32, window_ms: float = 5.0):
+        self.base = base
+        self.max_batch = max_batch
+        self.window = window_ms / 1000
+        self._queue: asyncio.Queue | None = None
+        self._drainer: asyncio.Task | None = None
+
+    def embed_documents(self, texts: list[str]) -> list[list[float]]:
+        return self.base.embed_documents(texts)
+
+    def embed_query(self, text: str) -> list[float]:
+        return self.base.embed_documents([text])[0]
+
+    async def aembed_documents(self, texts: list[str]) -> list[list[float]]:
+        loop = asyncio.get_running_loop()
+        return await loop.run_in_executor(None, self.base.embed_documents, texts)
+
+    async def aembed_query(self, text: str) -> list[float]:
+        loop = asyncio.get_running_loop()
+        if self._queue is None:
+            self._queue = asyncio.Queue()
+            self._drainer = asyncio.create_task(self._drain())
+        future: asyncio.Future = loop.create_future()
+        self._queue.put_nowait((text, future))
+        return await future
+
+    async def _drain(self) -> None:
+        loop = asyncio.get_running_loop()
+        while True:
+            batch = [await self._queue.get()]
+            deadline = loop.time() + self.window
+            while len(batch) < self.max_batch:
+                timeout = deadline - loop.time()
+                if timeout <= 0:
+                    break
+                try:
+                    batch.append(await asyncio.wait_for(self._queue.get(), timeout))
+                except asyncio.TimeoutError:
+                    break
+            texts = [text for text, _ in batch]
+            try:
+                vectors = await loop.run_in_executor(
+                    None, self.base.embed_documents, texts
+                )
+                for (_, future), vector in zip(batch, vectors):
+                    if not future.done():
+                        future.set_result(vector)
+            except Exception as exc:
+                for _, future in batch:
+                    if not future.done():
+                        future.set_exception(exc)
+
+
+# One client per process: httpx pools keep-alive connections, so every
+# question after the first skips the TCP/TLS handshake, and repeated
+# run_evaluation calls in the same process reuse the warm pool.
+_client: httpx.AsyncClient | None = None
+
+
+def _get_client() -> httpx.AsyncClient:
+    global _client
+    if _client is None or _client.is_closed:
+        _client = httpx.AsyncClient(timeout=60)
+    return _client
+
+
+async def generate_answers(eval_data):
+    """Ask the gateway every eval question concurrently.
+
+    The calls are LLM-latency bound, so they are fired together with
+    asyncio.gather instead of one blocking request at a time — wall clock
+    is roughly max(per-call latency) rather than the sum.
+    """
+    client = _get_client()
+    semaphore = asyncio.Semaphore(MAX_CONCURRENCY)
+    headers = {"content-type": "application/json"}
+
+    async def _fetch(body: bytes):
+        async with semaphore:
+            return await client.post(API_URL, content=body, headers=headers)
+
+    # Serialize each payload to bytes up front with orjson; httpx then
+    # ships them as-is instead of re-running stdlib json.dumps per post.
+    bodies = [
+        orjson.dumps(
+            {
+                "messages": [{"role": "user", "content": item["question"]}],
+                "temperature": 0.0,
+            }
+        )
+        for item in eval_data
+    ]
+    tasks = [_fetch(body) for body in bodies]
+    responses = await asyncio.gather(*tasks, return_exceptions=True)
+
+    results = []
+    for item, resp in zip(eval_data, responses):
+        if isinstance(resp, Exception):
+            print(f"Request failed for {item['question']!r}: {resp}")
+            continue
+        answer = resp.json()["choices"][0]["message"]["content"]
+        results.append(
+            {
+                "question": item["question"],
+                "answer": answer,
+                "contexts": [item["ground_truth"]],
+                "ground_truth": item["ground_truth"],
+            }
+        )
+    return results
+
+
+def run_evaluation():
+    import mlflow
+    from datasets import Dataset
+    from mlflow.entities import Metric, Param
+    from mlflow.tracking import MlflowClient
+    from ragas import evaluate
+    from ragas.embeddings import LangchainEmbeddingsWrapper
+    from ragas.llms import LangchainLLMWrapper
+    from ragas.metrics import answer_relevancy, faithfulness
+    from ragas.run_config import RunConfig
+
+    results = asyncio.run(generate_answers(EVAL_DATA))
+    if not results:
+        raise RuntimeError("No answers generated - is the gateway running?")
+
+    # from_list goes straight to Arrow; the from_pandas route would copy
+    # list[dict] -> DataFrame -> Arrow for nothing.
+    dataset = Dataset.from_list(results)
+    if os.getenv("RAGAS_USE_BATCH_API") == "1":
+        from batch_judge import BatchJudgeLLM
+
+        judge = BatchJudgeLLM()
+    else:
+        judge = LangchainLLMWrapper(get_azure_llm())
+
+    # Fan the per-row judge calls out instead of running them serially;
+    # a slow judge call should neither block the rest nor fail the run.
+    scores = evaluate(
+        dataset,
+        metrics=[faithfulness, answer_relevancy],
+        llm=judge,
+        embeddings=LangchainEmbeddingsWrapper(MicroBatchingEmbeddings(get_embedder())),
+        run_config=RunConfig(
+            max_workers=int(os.getenv("RAGAS_WORKERS", "32")),
+            timeout=120,
+            max_retries=3,
+        ),
+        raise_exceptions=False,
+    )
+
+    mlflow.set_experiment("llmops-lab1-eval")
+    with mlflow.start_run(run_name="ragas-eval") as run:
+        # log_table serializes in memory and uploads once — no temp file,
+        # no fsync, no cleanup. Submitted first so the upload overlaps
+        # the batched metric write below.
+        table_future = _ARTIFACT_POOL.submit(
+            MlflowClient().log_table,
+            run.info.run_id,
+            data=scores.to_pandas(),
+            artifact_file="eval_results.json",
+        )
+
+        # One batched write instead of a round trip per metric/param.
+        ts = int(time.time() * 1000)
+        MlflowClient().log_batch(
+            run.info.run_id,
+            metrics=[Metric(k, float(v), ts, 0) for k, v in scores.items()],
+            params=[
+                Param("eval_count", str(len(results))),
+                Param("judge_model", os.getenv("AZURE_OPENAI_DEPLOYMENT", "gpt-4o-mini")),
+            ],
+        )
+
+        # Join before the run closes: a failed upload must raise here,
+        # and log_table's loggedArtifacts tag has to land while the run
+        # is still live.
+        table_future.result()
+
+    print(scores)
+    return scores
+
+
+if __name__ == "__main__":
+    run_evaluation()
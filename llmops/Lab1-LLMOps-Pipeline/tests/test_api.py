@@ -0,0 +1,60 @@
+"""API smoke tests for the Lab 1 gateway.
+
+Start Redis and the gateway first, then run with pytest or directly:
+
+    python tests/test_api.py
+"""
+
+import os
+import time
+
+import requests
+from requests.adapters import HTTPAdapter
+from urllib3.util.retry import Retry
+
+BASE_URL = os.getenv("API_BASE_URL", "http://localhost:8000")
+API_URL = f"{BASE_URL}/v1/chat/completions"
+
+# One keep-alive session for every call: a fresh connection per request
+# pays a TCP (+TLS) handshake that would otherwise dominate — and
+# distort — the cache-latency assertion below.
+_SESSION = requests.Session()
+_SESSION.mount(
+    "http://",
+    HTTPAdapter(
+        pool_connections=16,
+        pool_maxsize=16,
+        max_retries=Retry(total=3, backoff_factor=0.2),
+    ),
+)
+
+PAYLOAD = {
+    "messages": [{"role": "user", "content": "What is MLOps in one sentence?"}],
+    "temperature": 0.0,
+}
+
+
+def test_health():
+    resp = _SESSION.get(f"{BASE_URL}/health", timeout=5)
+    assert resp.status_code == 200
+    assert resp.json()["status"] == "ok"
+
+
+def test_chat_endpoint():
+    t0 = time.perf_counter()
+    first = _SESSION.post(API_URL, json=PAYLOAD, timeout=60)
+    t1 = time.perf_counter() - t0
+    assert first.status_code == 200
+
+    t0 = time.perf_counter()
+    second = _SESSION.post(API_URL, json=PAYLOAD, timeout=60)
+    t2 = time.perf_counter() - t0
+    assert second.status_code == 200
+    assert second.headers.get("X-Cache") in ("exact-hit", "semantic-hit")
+    assert t2 < t1 * 0.5, f"cache hit not faster: {t1:.2f}s then {t2:.2f}s"
+
+
+if __name__ == "__main__":
+    test_health()
+    test_chat_endpoint()
+    print("API smoke tests passed")
@@ -0,0 +1,28 @@
+"""Local sanity checks for the eval harness — no services required.
+
+Importing eval_ragas must stay cheap: the Azure judge and the MiniLM
+embedder are lazy singletons, so nothing should be constructed (and no
+model downloaded) until run_evaluation actually needs them.
+
+    python tests/test_eval_local.py
+"""
+
+import eval_ragas
+
+
+def test_import_builds_no_clients():
+    assert eval_ragas.get_azure_llm.cache_info().currsize == 0
+    assert eval_ragas.get_embedder.cache_info().currsize == 0
+
+
+def test_eval_data_shape():
+    assert eval_ragas.EVAL_DATA
+    for item in eval_ragas.EVAL_DATA:
+        assert item["question"]
+        assert item["ground_truth"]
+
+
+if __name__ == "__main__":
+    test_import_builds_no_clients()
+    test_eval_data_shape()
+    print("Local eval checks passed")
@@ -0,0 +1,114 @@
+"""Hardened chat service for the Lab 2 LLM security exercises.
+
+Counterpart to the vulnerable app: prompt-injection markers are blocked
+on the way in, completions run behind NeMo Guardrails, PII is scrubbed
+from the output with Presidio, and uploads are checked against a hash
+blocklist.
+
+    python app.py          # multi-worker uvloop server
+    uvicorn app:app --port 8000 --reload   # dev, single worker
+"""
+
+import hashlib
+import os
+import re
+from functools import lru_cache
+
+from fastapi import FastAPI, File, Form, UploadFile
+
+from llm_cache import cached_completion
+
+app = FastAPI(title="Lab 2 Secure LLM App")
+
+# Built on startup, not at import: nemoguardrails and presidio are
+# multi-second imports, and constructing the engines on top of that
+# would make `python -c "import app"`, test collection, and uvicorn's
+# module scan all pay for it.
+rails = None
+analyzer = None
+anonymizer = None
+
+
+@app.on_event("startup")
+def _build_engines() -> None:
+    global rails, analyzer, anonymizer
+    from nemoguardrails import LLMRails, RailsConfig
+    from presidio_analyzer import AnalyzerEngine
+    from presidio_anonymizer import AnonymizerEngine
+
+    config = RailsConfig.from_path(os.path.join(os.path.dirname(__file__), "config"))
+    rails = LLMRails(config=config)
+
+    analyzer = AnalyzerEngine()
+    anonymizer = AnonymizerEngine()
+    # Force the lazy spaCy model load now instead of adding 1-3s to the
+    # first /chat request.
+    analyzer.analyze(text="warmup", language="en")
+
+# Known prompt-injection markers exercised by the lab's scripted attacks.
+# One compiled, case-insensitive scan instead of a .lower() copy plus a
+# pass per pattern; \b keeps "dan" from matching inside ordinary words.
+# Grow the list here — or switch to pyahocorasick if it gets long.
+_BLOCK_RE = re.compile(r"ignore previous|\bdan\b|do anything now|pwned", re.IGNORECASE)
+
+# SHA-256 digests of files the upload endpoint must reject. Stored as
+# raw bytes so the hot path compares digests without hex encoding.
+KNOWN_MALICIOUS_HASHES = {
+    "e3b0c44298fc1c149afbf4c8996fb92427ae41e4649b934ca495991b7852b855",
+    "275a021bbfb6489e54d471899f7db9d1663fc695ec2fe2a2c4538aabf651fd0f",
+}
+_KNOWN_MALICIOUS = {bytes.fromhex(h) for h in KNOWN_MALICIOUS_HASHES}
+
+
+def sanitize_input(text: str) -> str:
+    if _BLOCK_RE.search(text):
+        return "BLOCKED: prompt injection attempt detected"
+    return text
+
+
+@lru_cache(maxsize=2048)
+def _analyze(text: str) -> tuple:
+    # spaCy NER dominates the output path; identical responses are very
+    # common with temperature-0 completions plus the LLM cache, so memoize
+    # per response text. Tuple for hashability in the cache.
+    return tuple(analyzer.analyze(text=text, language="en"))
+
+
+def scrub_pii(text: str) -> str:
+    findings = list(_analyze(text))
+    return anonymizer.anonymize(text=text, analyzer_results=findings).text
+
+
+@app.post("/chat")
+async def secure_chat(message: str = Form(...), file: UploadFile | None = File(None)):
+    if file is not None:
+        # Stream the upload through the hash in 1 MiB chunks instead of
+        # reading a multi-MB file into RAM just to fingerprint it.
+        sha = hashlib.sha256()
+        while chunk := await file.read(1 << 20):
+            sha.update(chunk)
+        if sha.digest() in _KNOWN_MALICIOUS:
+            return {"response": "BLOCKED: known malicious file"}
+
+    cleaned = sanitize_input(message)
+    if cleaned.startswith("BLOCKED"):
+        return {"response": cleaned}
+
+    answer = await cached_completion(rails, [{"role": "user", "content": cleaned}])
+    return {"response": scrub_pii(answer)}
+
+
+if __name__ == "__main__":
+    import uvicorn
+
+    # Guardrails + Presidio are CPU-bound, so one worker serializes every
+    # request behind the GIL; spread them across cores and use the uvloop
+    # event loop / httptools parser for the async I/O in between.
+    uvicorn.run(
+        "app:app",
+        host="0.0.0.0",
+        port=int(os.getenv("PORT", "8000")),
+        workers=int(os.getenv("WEB_CONCURRENCY", "4")),
+        loop="uvloop",
+        http="httptools",
+    )
@@ -0,0 +1,62 @@
+"""Deterministic exact-match cache for guardrailed LLM calls.
+
+Dev and test loops replay identical temperature-0 prompts constantly;
+each replay used to be a fresh paid completion. Responses are keyed by
+sha256 of the canonical JSON of (model, messages, temperature) and kept
+in Redis for an hour. Non-deterministic calls (temperature != 0) bypass
+the cache entirely.
+"""
+
+import hashlib
+import json
+import logging
+import os
+
+import redis.asyncio as aioredis
+
+logger = logging.getLogger("llm_cache")
+
+TTL_SECONDS = 3600
+
+_redis = aioredis.Redis(
+    host=os.getenv("REDIS_HOST", "localhost"),
+    port=int(os.getenv("REDIS_PORT", "6379")),
+    decode_responses=True,
+)
+_hits = 0
+_misses = 0
+
+
+def cache_key(model: str, messages: list[dict], temperature: float) -> str:
+    blob = json.dumps(
+        {"model": model, "messages": messages, "temperature": temperature},
+        sort_keys=True,
+    )
+    return "llm:" + hashlib.sha256(blob.encode()).hexdigest()
+
+
+async def _generate(rails, messages: list[dict]) -> str:
+    result = await rails.generate_async(messages=messages)
+    return result["content"] if isinstance(result, dict) else str(result)
+
+
+async def cached_completion(
+    rails, messages: list[dict], model: str = "rails", temperature: float = 0.0
+) -> str:
+    """Serve a guardrailed completion, caching deterministic ones."""
+    global _hits, _misses
+    if temperature != 0.0:
+        return await _generate(rails, messages)
+
+    key = cache_key(model, messages, temperature)
+    cached = await _redis.get(key)
+    if cached is not None:
+        _hits += 1
+        logger.debug("llm cache hit (%d hits / %d misses)", _hits, _misses)
+        return cached
+
+    _misses += 1
+    logger.debug("llm cache miss (%d hits / %d misses)", _hits, _misses)
+    answer = await _generate(rails, messages)
+    await _redis.set(key, answer, ex=TTL_SECONDS)
+    return answer
@@ -0,0 +1,67 @@
+"""Deliberately vulnerable chat service for the Lab 2 exercises.
+
+Counterpart to the secure app: no input sanitization, no guardrails, no
+PII scrubbing, and uploaded PDFs go straight into the RAG index. The one
+production-grade piece is the embedding layer — Azure embeddings sit
+behind a file-backed cache (shared with the Lab 1 eval harness through
+EMB_CACHE_DIR), so re-ingesting the same document costs disk reads, not
+another round of paid API calls.
+
+    uvicorn app:app --port 8001
+"""
+
+import io
+import os
+
+from fastapi import FastAPI, File, Form, UploadFile
+from langchain.embeddings import CacheBackedEmbeddings
+from langchain.storage import LocalFileStore
+from langchain_community.vectorstores import Chroma
+from langchain_text_splitters import RecursiveCharacterTextSplitter
+from pypdf import PdfReader
+from langchain_openai import AzureChatOpenAI, AzureOpenAIEmbeddings
+
+app = FastAPI(title="Lab 2 Vulnerable LLM App")
+
+EMB_CACHE_DIR = os.getenv(
+    "EMB_CACHE_DIR", os.path.expanduser("~/.cache/llmops-embeddings")
+)
+EMBED_DEPLOYMENT = os.getenv("AZURE_OPENAI_EMBED_DEPLOYMENT", "text-embedding-3-small")
+
+# Namespacing by deployment keeps vectors from different models from
+# colliding in the shared store.
+embeddings = CacheBackedEmbeddings.from_bytes_store(
+    AzureOpenAIEmbeddings(azure_deployment=EMBED_DEPLOYMENT),
+    LocalFileStore(EMB_CACHE_DIR),
+    namespace=EMBED_DEPLOYMENT,
+)
+vectorstore = Chroma(collection_name="uploads", embedding_function=embeddings)
+llm = AzureChatOpenAI(
+    azure_deployment=os.getenv("AZURE_OPENAI_DEPLOYMENT", "gpt-4o-mini"),
+    temperature=0.0,
+)
+
+
+_SPLITTER = RecursiveCharacterTextSplitter(chunk_size=500, chunk_overlap=50)
+
+
+@app.post("/upload")
+async def upload(file: UploadFile = File(...)):
+    # Vulnerable by design: indexed with no content checks (the secure
+    # app is the counterpoint). Parsed straight from memory, though — the
+    # old write-to-/tmp-then-PyPDFLoader round trip doubled the I/O and
+    # leaked client-named files onto disk.
+    reader = PdfReader(io.BytesIO(await file.read()))
+    texts = [page.extract_text() or "" for page in reader.pages]
+    docs = _SPLITTER.create_documents(texts)
+    vectorstore.add_documents(docs)
+    return {"status": "indexed", "chunks": len(docs)}
+
+
+@app.post("/chat")
+async def chat(message: str = Form(...)):
+    docs = vectorstore.similarity_search(message, k=3)
+    context = "\n\n".join(d.page_content for d in docs)
+    prompt = f"Context:\n{context}\n\nQuestion: {message}"
+    answer = llm.invoke(prompt)
+    return {"response": answer.content}
@@ -0,0 +1,117 @@
+"""Environment loading for the Test-Lab1 exercises.
+
+Reads the lab's `.env` secrets file into os.environ and exposes small
+config getters on top. The parse is cached per (path, mtime): test and
+CLI entrypoints call load_env_from_secrets repeatedly, and re-parsing an
+unchanged file every call is pure waste — the cache key includes the
+file's mtime so an edited file still reloads.
+"""
+
+import functools
+import os
+import re
+from pathlib import Path
+
+ENV_PATH = Path(__file__).resolve().parent / ".env"
+
+REQUIRED_VARS = ("LLM_PROVIDER",)
+
+# One C-level pass over the whole file: group 1 is the key, at most one
+# of groups 2/3/4 holds the value (double-quoted, single-quoted, bare;
+# none of them for an empty value). Blank lines, comment lines, and
+# trailing comments fall out for free. Whitespace inside a line must be
+# [^\S\n] (horizontal only): under MULTILINE a plain \s would swallow
+# the newline after `KEY=` and consume the next line as the value.
+_ENV_RE = re.compile(
+    r"""^[^\S\n]*([A-Za-z_][A-Za-z0-9_]*)[^\S\n]*=[^\S\n]*"""
+    r"""(?:"([^"]*)"|'([^']*)'|([^\s#][^\n]*?)?)[^\S\n]*(?:#.*)?$""",
+    re.MULTILINE,
+)
+
+
+@functools.lru_cache(maxsize=8)
+def _parse_env_file(path: str, mtime_ns: int) -> dict:
+    """Parse a KEY=VALUE env file into a dict, cached by (path, mtime).
+
+    mtime_ns is part of the cache key, not used in the body: a touched
+    file gets a fresh parse, an unchanged one is a dict lookup.
+    """
+    env_vars = {}
+    for match in _ENV_RE.finditer(Path(path).read_text()):
+        key, dq, sq, bare = match.groups()
+        if dq is not None:
+            value = dq
+        elif sq is not None:
+            value = sq
+        else:
+            value = bare if bare is not None else ""
+        env_vars[key] = value
+    return env_vars
+
+
+def load_env_from_secrets(path: str | os.PathLike = ENV_PATH) -> dict:
+    """Load the secrets file into os.environ; returns the parsed vars."""
+    stat = os.stat(path)
+    env_vars = _parse_env_file(os.fspath(path), stat.st_mtime_ns)
+    # One bulk update: every os.environ[key] assignment goes through the
+    # putenv proxy individually, so N writes become one call here.
+    os.environ.update(env_vars)
+
+    missing = set(REQUIRED_VARS) - os.environ.keys()
+    if missing:
+        raise RuntimeError(f"Missing required env vars: {', '.join(sorted(missing))}")
+    return env_vars
+
+
+@functools.lru_cache(maxsize=1)
+def get_llm_provider() -> str:
+    return os.getenv("LLM_PROVIDER", "azure")
+
+
+@functools.lru_cache(maxsize=1)
+def get_openai_api_key() -> str:
+    key = os.getenv("OPENAI_API_KEY")
+    if not key:
+        raise RuntimeError("OPENAI_API_KEY is not set")
+    return key
+
+
+@functools.lru_cache(maxsize=1)
+def get_azure_openai_config() -> dict:
+    config = {
+        "azure_endpoint": os.getenv("AZURE_OPENAI_ENDPOINT"),
+        "api_key": os.getenv("AZURE_OPENAI_API_KEY"),
+        "api_version": os.getenv("AZURE_OPENAI_API_VERSION", "2024-02-01"),
+        "deployment": os.getenv("AZURE_OPENAI_DEPLOYMENT", "gpt-4o-mini"),
+    }
+    if not config["azure_endpoint"] or not config["api_key"]:
+        raise RuntimeError("AZURE_OPENAI_ENDPOINT / AZURE_OPENAI_API_KEY not set")
+    return config
+
+
+def reload_env(path: str | os.PathLike = ENV_PATH) -> dict:
+    """Force a fresh load: drop the memoized getters, then reload.
+
+    The getters are cached for request-path callers, so env changes made
+    after first use are invisible until this is called.
+    """
+    get_llm_provider.cache_clear()
+    get_openai_api_key.cache_clear()
+    get_azure_openai_config.cache_clear()
+    return load_env_from_secrets(path)
+
+
+def get_openai_client():
+    """Build the provider-appropriate OpenAI client from the loaded env."""
+    if get_llm_provider() == "azure":
+        from openai import AzureOpenAI
+
+        config = get_azure_openai_config()
+        return AzureOpenAI(
+            azure_endpoint=config["azure_endpoint"],
+            api_key=config["api_key"],
+            api_version=config["api_version"],
+        )
+    from openai import OpenAI
+
+    return OpenAI(api_key=get_openai_api_key())
@@ -0,0 +1,329 @@
+"""Single-file demo gateway for live walkthrough sessions.
+
+Deliberately simpler than the Lab 1 gateway: synchronous Azure OpenAI
+SDK calls, Redis exact-match caching with an in-process fallback when
+Redis isn't running, per-request MLflow tracking, and optional
+OpenTelemetry spans when the SDK is installed.
+
+    uvicorn app.main:app --port 8100
+"""
+
+import concurrent.futures
+import hashlib
+import logging
+import os
+import time
+from contextlib import nullcontext
+from datetime import datetime
+from functools import lru_cache
+
+import httpx
+import mlflow
+import orjson
+from mlflow.tracking import MlflowClient
+import redis
+import redis.asyncio as aioredis
+from fastapi import BackgroundTasks, FastAPI
+from jinja2 import Environment, StrictUndefined
+from openai import AsyncAzureOpenAI
+from pydantic import BaseModel
+
+logging.basicConfig(level=os.getenv("LOG_LEVEL", "INFO"))
+logger = logging.getLogger("llmops-demo")
+
+SENSITIVE = frozenset({"authorization", "api-key"})
+
+
+async def log_request(request):
+    # Even with the hook installed, don't build the redacted dict unless
+    # a debug handler will actually emit it.
+    if not logger.isEnabledFor(logging.DEBUG):
+        return
+    logger.debug(
+        "OUTGOING HEADERS: %s",
+        {
+            k: f"<redacted, {len(v)} chars>" if k.lower() in SENSITIVE else repr(v)
+            for k, v in request.headers.items()
+        },
+    )
+
+
+async def log_response(response):
+    logger.debug("RESPONSE STATUS: %s", response.status_code)
+
+
+def get_llm_config() -> AsyncAzureOpenAI:
+    # The header-dump hooks walk every outgoing header and write to the
+    # log on each LLM call; keep them out of the hot path unless someone
+    # is actually debugging.
+    if os.getenv("LLM_DEBUG_HEADERS") == "1":
+        http_client = httpx.AsyncClient(
+            event_hooks={"request": [log_request], "response": [log_response]}
+        )
+    else:
+        http_client = httpx.AsyncClient()
+    return AsyncAzureOpenAI(
+        azure_endpoint=os.getenv("AZURE_OPENAI_ENDPOINT", ""),
+        api_key=os.getenv("AZURE_OPENAI_API_KEY", ""),
+        api_version=os.getenv("AZURE_OPENAI_API_VERSION", "2024-02-01"),
+        http_client=http_client,
+    )
+
+
+AZURE_CLIENT = get_llm_config()
+DEPLOYMENT = os.getenv("AZURE_OPENAI_DEPLOYMENT", "gpt-4o-mini")
+
+
+class MockRedis:
+    """In-process stand-in so the demo runs without a Redis container."""
+
+    def __init__(self):
+        self._store: dict = {}
+
+    async def get(self, key):
+        return self._store.get(key)
+
+    async def setex(self, key, ttl, value):
+        self._store[key] = value
+
+
+try:
+    # Probe with a short-lived sync client; the app itself talks to
+    # Redis through the asyncio client so lookups never block the loop.
+    redis.Redis(host=os.getenv("REDIS_HOST", "localhost"), port=6379).ping()
+    # Explicit pool: concurrent requests each borrow a connection
+    # instead of serializing on one.
+    r = aioredis.Redis(
+        connection_pool=aioredis.ConnectionPool(
+            host=os.getenv("REDIS_HOST", "localhost"),
+            port=6379,
+            max_connections=32,
+            decode_responses=True,
+        )
+    )
+except redis.RedisError:
+    logger.warning("Redis unavailable, using in-process cache")
+    r = MockRedis()
+
+PROMPT_PATH = os.path.join(
+    os.path.dirname(os.path.abspath(__file__)), "..", "prompts", "prompt_template.jinja2"
+)
+with open(PROMPT_PATH) as f:
+    PROMPT_CONTENT = f.read()
+PROMPT_SHA = hashlib.sha256(PROMPT_CONTENT.encode()).hexdigest()[:12]
+# Explicit environment instead of the bare Template() default:
+# no reload-stat checks, AST optimizer on, and StrictUndefined so a
+# template/variable mismatch fails loudly instead of rendering blanks.
+_jinja_env = Environment(
+    auto_reload=False,
+    optimized=True,
+    undefined=StrictUndefined,
+    cache_size=400,
+)
+prompt_template = _jinja_env.from_string(PROMPT_CONTENT)
+
+_USERQ_SENTINEL = "\x00USERQ\x00"
+
+
+@lru_cache(maxsize=64)
+def _prompt_parts(current_date: str, department: str) -> tuple[str, str]:
+    """Rendered template split around the user question.
+
+    Everything except the question is fixed per (date, department), so
+    render once with a sentinel question, split on it, and cache the
+    halves — the per-request cost becomes one string concatenation.
+    """
+    rendered = prompt_template.render(
+        current_date=current_date,
+        department=department,
+        user_question=_USERQ_SENTINEL,
+    )
+    prefix, _, suffix = rendered.partition(_USERQ_SENTINEL)
+    return prefix, suffix
+
+try:
+    from opentelemetry import trace
+
+    tracer = trace.get_tracer("llmops-demo")
+except ImportError:
+    tracer = None
+
+
+def _span(name: str):
+    """Tracer span when OTel is installed, free no-op otherwise."""
+    return tracer.start_as_current_span(name) if tracer else nullcontext()
+
+app = FastAPI(title="LLMOps Demo Gateway")
+
+# Artifact uploads are storage round-trips the client never waits on;
+# they run here instead of on the request path.
+_ARTIFACT_POOL = concurrent.futures.ThreadPoolExecutor(max_workers=2)
+
+
+@app.on_event("startup")
+def _upload_prompt_template() -> None:
+    # The template is invariant for the process lifetime; upload it to
+    # one prompt-versions run at startup and let per-request runs carry
+    # only the prompt_sha tag to correlate with it.
+    def _log_prompt() -> None:
+        mlflow.set_experiment("llmops-demo")
+        with mlflow.start_run(run_name=f"prompt-{PROMPT_SHA}"):
+            mlflow.set_tag("prompt_sha", PROMPT_SHA)
+            mlflow.log_text(PROMPT_CONTENT, "prompt_template.jinja2")
+
+    _ARTIFACT_POOL.submit(_log_prompt)
+
+
+class ChatMessage(BaseModel):
+    role: str
+    content: str
+
+
+class ChatCompletionRequest(BaseModel):
+    messages: list[ChatMessage]
+    department: str = "general"
+    temperature: float = 0.0
+    max_tokens: int = 512
+
+
+def _pack(response) -> dict:
+    """Just the fields needed to rebuild the envelope on a cache hit.
+
+    The full model_dump duplicates nulls and per-choice metadata nobody
+    reads back; this keeps the Redis value (and the bytes per hit) small.
+    """
+    choice = response.choices[0]
+    return {
+        "id": response.id,
+        "created": response.created,
+        "model": response.model,
+        "content": choice.message.content,
+        "finish_reason": choice.finish_reason,
+        "usage": {
+            "prompt_tokens": response.usage.prompt_tokens,
+            "completion_tokens": response.usage.completion_tokens,
+            "total_tokens": response.usage.total_tokens,
+        },
+    }
+
+
+def _unpack(d: dict) -> dict:
+    return {
+        "id": d["id"],
+        "object": "chat.completion",
+        "created": d["created"],
+        "model": d["model"],
+        "choices": [
+            {
+                "index": 0,
+                "message": {"role": "assistant", "content": d["content"]},
+                "finish_reason": d["finish_reason"],
+            }
+        ],
+        "usage": d["usage"],
+    }
+
+
+def get_cache_key(messages: list[ChatMessage], department: str) -> str:
+    # Feed role/content straight into the digest with separator bytes,
+    # reading the pydantic models by attribute — no model_dump list, no
+    # canonical JSON string, no per-message dict allocations.
+    # BLAKE2b on purpose: this is a cache key, not a security boundary,
+    # and it's 2-3x faster than SHA-256 on machines without SHA-NI.
+    # Don't "upgrade" it back.
+    h = hashlib.blake2b(digest_size=16)
+    for m in messages:
+        h.update(m.role.encode())
+        h.update(b"\x1f")
+        h.update(m.content.encode())
+        h.update(b"\x1e")
+    h.update(department.encode())
+    return "demo-cache:" + h.hexdigest()
+
+
+@app.get("/health")
+async def health():
+    return {"status": "ok"}
+
+
+@app.post("/v1/chat/completions")
+async def chat_completions(request: ChatCompletionRequest, background: BackgroundTasks):
+    # perf_counter is the latency clock: a single monotonic float read,
+    # immune to wall-clock jumps, vs constructing datetime objects.
+    t0 = time.perf_counter()
+    cache_key = get_cache_key(request.messages, request.department)
+    with _span("cache-lookup"):
+        cached = await r.get(cache_key)
+    if cached:
+        # Hits do no LLM work, so they skip the MLflow run entirely —
+        # a run start/end is a pair of tracking-server round-trips.
+        logger.debug("cache hit %s", cache_key)
+        return _unpack(orjson.loads(cached))
+
+    mlflow.set_experiment("llmops-demo")
+    with mlflow.start_run(run_name=f"chat-{datetime.now():%Y%m%d-%H%M%S}") as run:
+        # One batched round-trip for all params instead of one per call.
+        mlflow.log_params(
+            {
+                "model": DEPLOYMENT,
+                "department": request.department,
+                "temperature": request.temperature,
+                "max_tokens": request.max_tokens,
+                "message_count": len(request.messages),
+                "provider": "azure",
+            }
+        )
+        mlflow.set_tag("prompt_sha", PROMPT_SHA)
+        metrics = {"cache_hit": 0}
+
+        user_msg = request.messages[-1].content
+        with _span("render-prompt"):
+            prefix, suffix = _prompt_parts(
+                datetime.now().strftime("%Y-%m-%d"), request.department
+            )
+            rendered = prefix + user_msg + suffix
+        # MlflowClient with an explicit run_id: the fluent API's active
+        # run is thread-local, so mlflow.log_text from a pool thread
+        # would land in a fresh orphan run, not this one.
+        run_id = run.info.run_id
+        _ARTIFACT_POOL.submit(
+            MlflowClient().log_text, run_id, rendered, "rendered_prompt.txt"
+        )
+        _ARTIFACT_POOL.submit(
+            MlflowClient().log_text, run_id, user_msg, "user_message.txt"
+        )
+
+        t_llm = time.perf_counter()
+        with _span("llm-call"):
+            response = await AZURE_CLIENT.chat.completions.create(
+                model=DEPLOYMENT,
+                messages=[{"role": "user", "content": rendered}],
+                temperature=request.temperature,
+                max_tokens=request.max_tokens,
+            )
+        metrics["llm_ms"] = (time.perf_counter() - t_llm) * 1000
+        metrics["prompt_tokens"] = response.usage.prompt_tokens
+        metrics["completion_tokens"] = response.usage.completion_tokens
+
+        packed = _pack(response)
+        # Write-behind: the cache fill runs after the response is sent,
+        # saving the client one Redis round-trip on every miss.
+        background.add_task(r.setex, cache_key, 3600, orjson.dumps(packed))
+        metrics["total_ms"] = (time.perf_counter() - t0) * 1000
+        # One batched round-trip for all metrics.
+        mlflow.log_metrics(metrics)
+        return _unpack(packed)
+
+
+if __name__ == "__main__":
+    import uvicorn
+
+    # The demo is I/O bound (LLM + Redis + MLflow over HTTP); uvloop and
+    # the httptools parser raise asyncio throughput with no code change.
+    uvicorn.run(
+        "main:app",
+        host="0.0.0.0",
+        port=int(os.getenv("PORT", "8100")),
+        loop="uvloop",
+        http="httptools",
+    )
@@ -0,0 +1,17 @@
+"""Launch the MLflow tracking UI for the demo.
+
+Replaces this interpreter with the mlflow process via exec rather than
+spawning it under subprocess.run: no parent Python left waiting, no
+extra fork, and signals (Ctrl-C, container SIGTERM) go straight to
+mlflow instead of needing to be forwarded.
+
+    python mlflow_server.py
+"""
+
+import os
+
+os.makedirs("mlflow", exist_ok=True)
+os.execvp(
+    "mlflow",
+    ["mlflow", "ui", "--backend-store-uri", "file:./mlflow", "--port", "5000"],
+)
@@ -0,0 +1,50 @@
+"""One-pass repair for the lab notebooks.
+
+Fixes the common breakages students hit after rerunning the labs in
+Colab: bare `pip install` lines missing the `!` prefix, and duplicated
+environment-setup cells left behind by repeated reruns.
+
+    python repair_nb.py [lab1.ipynb]
+"""
+
+import sys
+
+import orjson
+
+ENV_MARKER = "os.environ["
+
+
+def repair(nb_path: str) -> None:
+    with open(nb_path, "rb") as f:
+        nb = orjson.loads(f.read())
+
+    cells = nb["cells"]
+    env_indices = []
+    # Single pass: join each cell's source once, patch pip installs and
+    # collect duplicated env-setup cells in the same sweep.
+    for i, cell in enumerate(cells):
+        if cell.get("cell_type") != "code":
+            continue
+        src = "".join(cell["source"])
+        if src.lstrip().startswith("pip install"):
+            cell["source"] = [
+                "!" + line if line.lstrip().startswith("pip install") else line
+                for line in cell["source"]
+            ]
+        if ENV_MARKER in src:
+            env_indices.append(i)
+
+    # Keep the first env-setup cell, drop the rerun duplicates. Rebuild
+    # the list once instead of repeated del calls, each of which shifts
+    # every cell behind it.
+    drop = set(env_indices[1:])
+    if drop:
+        nb["cells"] = [cell for i, cell in enumerate(cells) if i not in drop]
+
+    with open(nb_path, "wb") as f:
+        f.write(orjson.dumps(nb, option=orjson.OPT_INDENT_2))
+    print(f"Repaired {nb_path} ({len(drop)} duplicate env cells removed)")
+
+
+if __name__ == "__main__":
+    repair(sys.argv[1] if len(sys.argv) > 1 else "lab1.ipynb")
@@ -0,0 +1,57 @@
+"""Report which of the lab-stack packages declare a dependency on annoy.
+
+Used when pinning the lab images: annoy needs a compiler at install
+time, so anything pulling it in transitively has to be caught before it
+lands in requirements. Each package's metadata comes from the PyPI JSON
+API; the fetches run concurrently over one keep-alive session, so wall
+time is roughly one round-trip instead of one per package.
+
+    python scripts/find_annoy_deps.py
+"""
+
+import concurrent.futures
+
+import requests
+
+PACKAGES = [
+    "chromadb",
+    "datasets",
+    "faiss-cpu",
+    "gensim",
+    "haystack-ai",
+    "hnswlib",
+    "langchain",
+    "langchain-community",
+    "lightfm",
+    "llama-index",
+    "mlflow",
+    "nmslib",
+    "ragas",
+    "redisvl",
+    "scikit-learn",
+    "sentence-transformers",
+    "transformers",
+    "txtai",
+]
+
+_SESSION = requests.Session()
+
+
+def fetch(pkg: str) -> tuple[str, bool]:
+    resp = _SESSION.get(f"https://pypi.org/pypi/{pkg}/json", timeout=10)
+    if resp.status_code != 200:
+        return pkg, False
+    requires = resp.json()["info"].get("requires_dist") or []
+    return pkg, any(req.partition(";")[0].strip().startswith("annoy") for req in requires)
+
+
+def main() -> None:
+    with concurrent.futures.ThreadPoolExecutor(max_workers=16) as ex:
+        for pkg, uses_annoy in ex.map(fetch, PACKAGES):
+            if uses_annoy:
+                print(f"{pkg}: depends on annoy")
+    print(f"Checked {len(PACKAGES)} packages")
+
+
+if __name__ == "__main__":
+    main()
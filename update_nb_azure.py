@@ -0,0 +1,48 @@
+"""Point the lab notebooks at Azure OpenAI.
+
+Rewrites any code cell that configures OpenAI with inline credentials to
+read the Azure endpoint, key, and deployment from environment variables
+instead, in a single pass over the notebook.
+
+    python update_nb_azure.py [lab1.ipynb]
+"""
+
+import sys
+
+import orjson
+
+AZURE_CONFIG_SOURCE = [
+    "import os\n",
+    "from openai import AzureOpenAI\n",
+    "\n",
+    "client = AzureOpenAI(\n",
+    '    azure_endpoint=os.environ["AZURE_OPENAI_ENDPOINT"],\n',
+    '    api_key=os.environ["AZURE_OPENAI_API_KEY"],\n',
+    '    api_version=os.getenv("AZURE_OPENAI_API_VERSION", "2024-02-01"),\n',
+    ")\n",
+    'DEPLOYMENT = os.getenv("AZURE_OPENAI_DEPLOYMENT", "gpt-4o-mini")\n',
+]
+
+
+def update(nb_path: str) -> None:
+    with open(nb_path, "rb") as f:
+        nb = orjson.loads(f.read())
+
+    replaced = 0
+    for cell in nb["cells"]:
+        if cell.get("cell_type") != "code":
+            continue
+        src = "".join(cell["source"])
+        if "openai.api_key" in src or "OPENAI_API_KEY" in src:
+            cell["source"] = list(AZURE_CONFIG_SOURCE)
+            cell["outputs"] = []
+            cell["execution_count"] = None
+            replaced += 1
+
+    with open(nb_path, "wb") as f:
+        f.write(orjson.dumps(nb, option=orjson.OPT_INDENT_2))
+    print(f"Updated {nb_path} ({replaced} config cells pointed at Azure)")
+
+
+if __name__ == "__main__":
+    update(sys.argv[1] if len(sys.argv) > 1 else "lab1.ipynb")